@@ -99,3 +99,8 @@ Here is {from_agent}'s handoff summary:
 
 Continue the conversation seamlessly. Acknowledge the transfer briefly, show you know what was discussed, and proceed with your expertise. Do not ask the user to repeat anything.
 """
+
+OPENING_LINE_PROMPT = """The homeowner has just joined the call and has not said anything yet.
+
+Greet them warmly as Bob in one or two short sentences and ask what renovation project they have in mind. Do not call any tools.
+"""
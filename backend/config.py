@@ -9,3 +9,6 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
 LIVEKIT_URL = os.getenv("LIVEKIT_URL", "")
 LIVEKIT_API_KEY = os.getenv("LIVEKIT_API_KEY", "")
 LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET", "")
+
+# Load-test endpoint /api/token/bulk is off unless explicitly enabled
+ENABLE_BULK_TOKENS = os.getenv("ENABLE_BULK_TOKENS", "").lower() in ("1", "true", "yes")
@@ -4,7 +4,7 @@ from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
 
 from graph.state import AgentState
-from agents.prompts import BOB_SYSTEM_PROMPT, ALICE_SYSTEM_PROMPT, TRANSFER_CONTEXT_TEMPLATE
+from agents.prompts import BOB_SYSTEM_PROMPT, ALICE_SYSTEM_PROMPT, TRANSFER_CONTEXT_TEMPLATE, OPENING_LINE_PROMPT
 from agents.tools import AGENT_TOOLS, transfer_to_agent, end_conversation
 from config import OPENAI_API_KEY, OPENAI_MODEL
 
@@ -20,6 +20,31 @@ def _get_llm():
     ).bind_tools(AGENT_TOOLS)
 
 
+async def warm_llm_connection():
+    """Open a pooled connection to the model API so the first turn skips the TLS handshake."""
+    client = ChatOpenAI(model=OPENAI_MODEL, api_key=OPENAI_API_KEY).root_async_client
+    await client.models.list()
+
+
+async def generate_opening_line() -> str:
+    """Pre-generate Bob's opening line."""
+    llm = ChatOpenAI(model=OPENAI_MODEL, api_key=OPENAI_API_KEY)
+    response = await llm.ainvoke([
+        SystemMessage(content=f"{BOB_SYSTEM_PROMPT}\n\n{OPENING_LINE_PROMPT}"),
+    ])
+    return response.content
+
+
+async def record_opening_line(graph, thread_id: str, text: str):
+    """Record Bob's opening line as the first turn on the conversation thread."""
+    config = {"configurable": {"thread_id": thread_id}}
+    await graph.aupdate_state(
+        config,
+        {"messages": [AIMessage(content=text)], "active_agent": "bob", "handoff_summary": ""},
+        as_node="bob",
+    )
+
+
 def _build_system_message(state: AgentState, agent_name: str) -> SystemMessage:
     """Build the system message for an agent, including transfer context if applicable."""
     base_prompt = BOB_SYSTEM_PROMPT if agent_name == "bob" else ALICE_SYSTEM_PROMPT
@@ -1,39 +1,85 @@
+import asyncio
+import json
+import logging
 import uuid
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from livekit import api
 from langchain_core.messages import HumanMessage
 
 from graph.builder import build_graph
-from config import LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET
+from config import LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET, ENABLE_BULK_TOKENS
 
 
+logger = logging.getLogger("renovation-api")
+
 router = APIRouter()
 graph = build_graph()
 
+AGENT_NAME = "renovation-assistant"
+MAX_BULK_TOKENS = 100
+
 
 # --- LiveKit Token ---
 
 class TokenRequest(BaseModel):
     room_name: str | None = None
     participant_name: str = "user"
+    prewarm: bool = False  # dispatch the agent now so setup overlaps the client connecting
+    opening_line: bool = False  # with prewarm, have Bob greet the user first
 
 
 class TokenResponse(BaseModel):
     token: str
     url: str
     room_name: str
+    prewarmed: bool = False
 
 
-@router.post("/token", response_model=TokenResponse)
-async def get_token(request: TokenRequest):
-    room_name = request.room_name or f"renovation-{uuid.uuid4().hex[:8]}"
+class BulkTokenRequest(BaseModel):
+    count: int = Field(default=10, ge=1, le=MAX_BULK_TOKENS)
+    participant_name: str = "loadtest"
+    prewarm: bool = False
+
+
+class BulkTokenResponse(BaseModel):
+    tokens: list[TokenResponse]
+
+
+def _livekit_api() -> api.LiveKitAPI:
+    return api.LiveKitAPI(LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
+
+
+async def _dispatch_agent(lkapi: api.LiveKitAPI, room_name: str, opening_line: bool) -> bool:
+    """Dispatch the agent into the room ahead of the user so it can pre-warm the session."""
+    try:
+        await lkapi.agent_dispatch.create_dispatch(api.CreateAgentDispatchRequest(
+            agent_name=AGENT_NAME,
+            room=room_name,
+            metadata=json.dumps({"prewarm": True, "opening_line": opening_line}),
+        ))
+        return True
+    except Exception as e:
+        logger.warning(f"Pre-warm dispatch failed for {room_name}: {e}")
+        return False
+
+
+async def _mint_token(
+    room_name: str | None,
+    participant_name: str,
+    lkapi: api.LiveKitAPI | None = None,
+    opening_line: bool = False,
+) -> TokenResponse:
+    """Mint a room token; with an API client, pre-warm by dispatching the agent first."""
+    room_name = room_name or f"renovation-{uuid.uuid4().hex[:8]}"
     participant_identity = f"user-{uuid.uuid4().hex[:6]}"
 
+    prewarmed = lkapi is not None and await _dispatch_agent(lkapi, room_name, opening_line)
+
     token = (
         api.AccessToken(LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
         .with_identity(participant_identity)
-        .with_name(request.participant_name)
+        .with_name(participant_name)
         .with_grants(api.VideoGrants(
             room_join=True,
             room=room_name,
@@ -41,20 +87,64 @@ async def get_token(request: TokenRequest):
             can_subscribe=True,
             can_publish_data=True,
         ))
-        .with_room_config(api.RoomConfiguration(
+    )
+    # Dispatch on join, unless the agent was already dispatched for pre-warm
+    if not prewarmed:
+        token = token.with_room_config(api.RoomConfiguration(
             agents=[
-                api.RoomAgentDispatch(agent_name="renovation-assistant"),
+                api.RoomAgentDispatch(agent_name=AGENT_NAME),
             ],
         ))
-    )
 
     return TokenResponse(
         token=token.to_jwt(),
         url=LIVEKIT_URL,
         room_name=room_name,
+        prewarmed=prewarmed,
     )
 
 
+@router.post("/token", response_model=TokenResponse)
+async def get_token(request: TokenRequest):
+    if request.prewarm and request.room_name:
+        # The room may already have an agent; pre-warming would dispatch a second one
+        raise HTTPException(status_code=400, detail="prewarm is only supported for new rooms")
+    if request.opening_line and not request.prewarm:
+        raise HTTPException(status_code=400, detail="opening_line requires prewarm")
+    if not request.prewarm:
+        return await _mint_token(request.room_name, request.participant_name)
+
+    lkapi = _livekit_api()
+    try:
+        return await _mint_token(
+            request.room_name,
+            request.participant_name,
+            lkapi=lkapi,
+            opening_line=request.opening_line,
+        )
+    finally:
+        await lkapi.aclose()
+
+
+@router.post("/token/bulk", response_model=BulkTokenResponse)
+async def get_tokens_bulk(request: BulkTokenRequest):
+    """Mint tokens for many fresh rooms at once, e.g. for load tests."""
+    if not ENABLE_BULK_TOKENS:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    # One API client shared across every dispatch in this request
+    lkapi = _livekit_api() if request.prewarm else None
+    try:
+        tokens = await asyncio.gather(*(
+            _mint_token(None, f"{request.participant_name}-{i}", lkapi=lkapi)
+            for i in range(request.count)
+        ))
+    finally:
+        if lkapi is not None:
+            await lkapi.aclose()
+    return BulkTokenResponse(tokens=list(tokens))
+
+
 class ChatRequest(BaseModel):
     message: str
     conversation_id: str | None = None
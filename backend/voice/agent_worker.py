@@ -7,21 +7,34 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env"))
 
+import asyncio
 import json
 import logging
+import time
 
-from livekit import agents
-from livekit.agents import AgentSession, Agent, AgentServer, ModelSettings, room_io
+from livekit import agents, rtc
+from livekit.agents import AgentSession, Agent, AgentServer, ModelSettings, metrics, room_io
 from livekit.plugins import openai, silero
 from langchain_core.messages import HumanMessage
 
-from graph.builder import build_graph
+from graph.builder import build_graph, generate_opening_line, record_opening_line, warm_llm_connection
 
 logger = logging.getLogger("renovation-agent")
 
 BOB_VOICE = "ash"
 ALICE_VOICE = "coral"
 
+# Per-session output modes the client can switch between over the data channel
+OUTPUT_MODES = ("audio", "text")
+# Approximate TTS speaking rate, used to estimate audio skipped in text mode.
+# Only assistant text committed to the conversation in text mode is counted.
+TTS_CHARS_PER_SECOND = 15.0
+
+# Pre-warmed rooms are dispatched before the user joins; give up if they never do
+PARTICIPANT_JOIN_TIMEOUT = 60.0
+# How long the greeting waits for the client to report its output mode
+OUTPUT_MODE_REPORT_TIMEOUT = 2.0
+
 
 class RenovationAgent(Agent):
     def __init__(self, graph, conversation_id: str, room, shared_tts):
@@ -35,11 +48,86 @@ class RenovationAgent(Agent):
         self._active_agent = "bob"
         self._room = room
         self._shared_tts = shared_tts
+        self._output_mode = "audio"
+        self._session_started = False
+        self._user_turn_started = False
+        self._tts_seconds_avoided = 0.0
+        self._mode_reported = asyncio.Event()
+        # Per-stage latencies in seconds, in the order they occurred
+        self._latencies: dict[str, list[float]] = {
+            "end_of_utterance": [],
+            "graph_ttft": [],
+            "tts_ttfb": [],
+        }
 
     @property
     def active_agent(self) -> str:
         return self._active_agent
 
+    @property
+    def output_mode(self) -> str:
+        return self._output_mode
+
+    @property
+    def tts_seconds_avoided(self) -> float:
+        return self._tts_seconds_avoided
+
+    def record_metrics(self, collected: metrics.AgentMetrics):
+        """Keep the pipeline latencies pre-warm affects, from the session's metrics events."""
+        if isinstance(collected, metrics.EOUMetrics):
+            self._latencies["end_of_utterance"].append(collected.end_of_utterance_delay)
+        elif isinstance(collected, metrics.TTSMetrics) and collected.ttfb >= 0:
+            # ttfb is negative when synthesis was cancelled before any audio
+            self._latencies["tts_ttfb"].append(collected.ttfb)
+
+    def latency_report(self) -> str:
+        """Summarize each pipeline stage for the first turn versus later turns."""
+        parts = []
+        for stage, values in self._latencies.items():
+            if not values:
+                continue
+            first, rest = values[0], values[1:]
+            if rest:
+                steady = sum(rest) / len(rest)
+                parts.append(f"{stage} first {first:.2f}s / steady avg {steady:.2f}s (n={len(rest)})")
+            else:
+                parts.append(f"{stage} first {first:.2f}s")
+        return ", ".join(parts) or "no turns"
+
+    async def wait_for_output_mode(self, timeout: float):
+        """Wait briefly for the client to report its output mode."""
+        try:
+            await asyncio.wait_for(self._mode_reported.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.info(f"No output mode reported after {timeout:.0f}s, using {self._output_mode}")
+
+    def set_output_mode(self, mode: str):
+        """Switch between audio and text-only output without restarting the session.
+
+        The mode the client reports is always re-applied; if the session has not
+        started yet it is buffered and applied in on_enter().
+        """
+        if mode not in OUTPUT_MODES:
+            logger.warning(f"Ignoring unknown output mode: {mode!r}")
+            return
+        if mode != self._output_mode:
+            logger.info(f"Output mode: {self._output_mode} → {mode}")
+        self._output_mode = mode
+        self._mode_reported.set()
+        if self._session_started:
+            self._apply_output_mode()
+
+    def _apply_output_mode(self):
+        # With audio output disabled the session skips TTS synthesis entirely
+        self.session.output.set_audio_enabled(self._output_mode == "audio")
+
+    async def on_enter(self):
+        self._session_started = True
+        self._apply_output_mode()
+
+    def record_tts_avoided(self, text: str):
+        self._tts_seconds_avoided += len(text) / TTS_CHARS_PER_SECOND
+
     async def llm_node(self, chat_ctx, tools, model_settings: ModelSettings):
         """Override LLM node to route through our LangGraph agent graph with streaming."""
         # Extract the latest user message from LiveKit's chat context
@@ -52,7 +140,10 @@ class RenovationAgent(Agent):
         if not user_msg:
             return
 
+        self._user_turn_started = True
         config = {"configurable": {"thread_id": self._conversation_id}}
+        turn_started = time.perf_counter()
+        first_token_at = None
 
         # Read the current active agent from graph state
         current_state = self._graph.get_state(config)
@@ -98,7 +189,16 @@ class RenovationAgent(Agent):
                             self._shared_tts.update_options(voice=voice)
                             await self._notify_agent_switch(node)
 
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                        latency = first_token_at - turn_started
+                        self._latencies["graph_ttft"].append(latency)
+                        logger.info(
+                            f"Turn {len(self._latencies['graph_ttft'])} first token after {latency:.2f}s"
+                        )
                     full_response.append(chunk.content)
+                    # In text mode the session's transcription stream carries
+                    # this text to the client unsynced, at LLM speed
                     yield chunk.content
 
         # Safety net: check final state for transfers we missed mid-stream
@@ -120,19 +220,7 @@ class RenovationAgent(Agent):
         response_text = "".join(full_response)
         if response_text:
             logger.info(f"[{self._active_agent}] Response: {response_text[:100]}...")
-            # Publish full text as data message for instant display when voice is off
-            try:
-                await self._room.local_participant.publish_data(
-                    payload=json.dumps({
-                        "type": "agent_response",
-                        "text": response_text,
-                        "agent": self._active_agent,
-                    }).encode(),
-                    reliable=True,
-                    topic="agent.events",
-                )
-            except Exception as e:
-                logger.warning(f"Failed to publish agent response data: {e}")
+            await self.publish_response(response_text)
 
         # Check if conversation was ended
         check_state = self._graph.get_state(config)
@@ -147,6 +235,31 @@ class RenovationAgent(Agent):
             except Exception as e:
                 logger.warning(f"Failed to publish conversation end: {e}")
 
+    async def say_opening_line(self, text: str):
+        """Speak Bob's pre-generated greeting, unless the user has already started talking."""
+        if self._user_turn_started:
+            logger.info("Dropping opening line: user turn already started")
+            return
+        await record_opening_line(self._graph, self._conversation_id, text)
+        self.session.say(text)
+        await self.publish_response(text)
+
+    async def publish_response(self, text: str):
+        """Publish full text as data message for instant display when voice is off."""
+        try:
+            await self._room.local_participant.publish_data(
+                payload=json.dumps({
+                    "type": "agent_response",
+                    "text": text,
+                    "agent": self._active_agent,
+                    "output_mode": self._output_mode,
+                }).encode(),
+                reliable=True,
+                topic="agent.events",
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish agent response data: {e}")
+
     async def _notify_agent_switch(self, agent_name: str):
         """Send a data message to the frontend so it can update the UI."""
         try:
@@ -166,6 +279,26 @@ def setup(proc: agents.JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
 
 
+async def prewarm_session(conversation_id: str, shared_tts, opening_line: bool) -> str | None:
+    """Warm TTS and model connections before the user's first turn.
+
+    Returns Bob's pre-generated opening line when requested, otherwise None.
+    """
+    started = time.perf_counter()
+    text = None
+    try:
+        shared_tts.prewarm()
+        if opening_line:
+            # Generating the greeting also opens the model connection
+            text = await generate_opening_line()
+        else:
+            await warm_llm_connection()
+    except Exception as e:
+        logger.warning(f"Session pre-warm failed: {e}")
+    logger.info(f"Pre-warmed session {conversation_id} in {time.perf_counter() - started:.2f}s")
+    return text
+
+
 async def entrypoint(ctx: agents.JobContext):
     conversation_id = ctx.room.name
     graph = build_graph()
@@ -175,6 +308,31 @@ async def entrypoint(ctx: agents.JobContext):
 
     agent = RenovationAgent(graph, conversation_id, ctx.room, shared_tts)
 
+    # /api/token dispatches with {"prewarm": true} so setup overlaps the client connecting
+    metadata = json.loads(ctx.job.metadata) if ctx.job.metadata else {}
+    prewarm_task = None
+    if metadata.get("prewarm"):
+        prewarm_task = asyncio.create_task(
+            prewarm_session(
+                conversation_id, shared_tts,
+                opening_line=bool(metadata.get("opening_line")),
+            )
+        )
+
+    # Client switches output mode ("audio" / "text") via data messages.
+    # Registered before session.start() so no message is missed while joining;
+    # the agent buffers the mode until the session is running.
+    @ctx.room.on("data_received")
+    def on_data_received(packet: rtc.DataPacket):
+        if packet.topic != "client.events":
+            return
+        try:
+            message = json.loads(packet.data.decode())
+        except ValueError:
+            return
+        if message.get("type") == "set_output_mode":
+            agent.set_output_mode(message.get("mode"))
+
     session = AgentSession(
         stt=openai.STT(model="gpt-4o-transcribe"),
         llm=openai.LLM(model="gpt-5"),
@@ -196,7 +354,51 @@ async def entrypoint(ctx: agents.JobContext):
         ),
     )
 
-    # No initial greeting — user speaks first
+    # Count skipped TTS from what the session actually committed, so interrupted
+    # replies only count the text that reached the client
+    @session.on("conversation_item_added")
+    def on_conversation_item_added(event):
+        item = event.item
+        if item.role == "assistant" and agent.output_mode == "text" and item.text_content:
+            agent.record_tts_avoided(item.text_content)
+
+    @session.on("metrics_collected")
+    def on_metrics_collected(event):
+        agent.record_metrics(event.metrics)
+
+    async def log_session_report():
+        logger.info(
+            f"Session {conversation_id} ended (prewarmed={prewarm_task is not None}): "
+            f"{agent.latency_report()}; "
+            f"~{agent.tts_seconds_avoided:.1f}s TTS avoided in text mode "
+            f"(estimated at {TTS_CHARS_PER_SECOND:.0f} chars/s from text sent to the client)"
+        )
+
+    ctx.add_shutdown_callback(log_session_report)
+
+    # No initial greeting unless one was pre-generated — otherwise user speaks first
+    if prewarm_task is not None:
+        # Hold user input while the greeting is pending so Bob can't greet after answering
+        hold_input = bool(metadata.get("opening_line"))
+        if hold_input:
+            session.input.set_audio_enabled(False)
+        try:
+            opening = await prewarm_task
+            # The agent was dispatched before the user joined; data packets and
+            # speech sent to an empty room are lost
+            try:
+                await asyncio.wait_for(ctx.wait_for_participant(), PARTICIPANT_JOIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.info(f"No participant joined pre-warmed room {conversation_id}, shutting down")
+                ctx.shutdown(reason="participant never joined")
+                return
+            if opening:
+                # Let a text-only client switch modes first so the greeting skips TTS
+                await agent.wait_for_output_mode(OUTPUT_MODE_REPORT_TIMEOUT)
+                await agent.say_opening_line(opening)
+        finally:
+            if hold_input:
+                session.input.set_audio_enabled(True)
 
 
 server = AgentServer(setup_fnc=setup)
@@ -17,6 +17,18 @@ import ThinkingIndicator from "@/components/ThinkingIndicator";
 import { ChatMessage, ActiveAgent } from "@/lib/types";
 import { getToken } from "@/lib/api";
 
+// Ask the agent to switch between audio and text-only output
+function publishOutputMode(room: Room, voiceEnabled: boolean) {
+  room.localParticipant
+    .publishData(
+      new TextEncoder().encode(
+        JSON.stringify({ type: "set_output_mode", mode: voiceEnabled ? "audio" : "text" })
+      ),
+      { reliable: true, topic: "client.events" }
+    )
+    .catch((err) => console.error("Failed to set output mode:", err));
+}
+
 export default function ChatPage() {
   const [messages, setMessages] = useState<ChatMessage[]>([]);
   const [activeAgent, setActiveAgent] = useState<ActiveAgent>("bob");
@@ -77,7 +89,8 @@ export default function ChatPage() {
     setIsConnecting(true);
 
     try {
-      const { token, url, room_name } = await getToken();
+      // Pre-warm so the agent is set up while we connect
+      const { token, url, room_name } = await getToken(undefined, undefined, true);
       setRoomName(room_name);
 
       const room = new Room({
@@ -144,7 +157,13 @@ export default function ChatPage() {
         }
       });
 
-      // Handle data messages (agent switch, instant text responses)
+      // Report our output mode if the agent joins after us — a pre-warmed agent
+      // waits for it before greeting
+      room.on(RoomEvent.ParticipantConnected, () => {
+        publishOutputMode(room, agentVoiceRef.current);
+      });
+
+      // Handle data messages (agent switch, conversation end)
       room.on(RoomEvent.DataReceived, (data: Uint8Array) => {
         try {
           const decoded = JSON.parse(new TextDecoder().decode(data));
@@ -154,17 +173,6 @@ export default function ChatPage() {
             setConversationEnded(true);
             setIsThinking(false);
             roomRef.current?.disconnect();
-          } else if (decoded.type === "agent_response" && !agentVoiceRef.current) {
-            // Voice is off — show full response text instantly
-            setIsThinking(false);
-            const msgId = `agent-instant-${Date.now()}`;
-            upsertMessage(msgId, {
-              content: decoded.text,
-              role: "assistant",
-              agent: decoded.agent as ActiveAgent,
-              timestamp: new Date(),
-              isTranscribing: false,
-            });
           }
         } catch {
           // Ignore non-JSON data
@@ -190,11 +198,8 @@ export default function ChatPage() {
               setIsThinking(false);
             }
 
-            // When voice is off, skip all agent transcription segments
-            // (full text arrives instantly via data message instead)
-            if (isAgent && !agentVoiceRef.current) {
-              continue;
-            }
+            // With voice off the agent runs in text-only mode, so its
+            // transcription streams at LLM speed instead of synced to audio
 
             upsertMessage(msgId, {
               content: segment.text,
@@ -213,6 +218,11 @@ export default function ChatPage() {
       });
 
       await room.connect(url, token);
+      // A pre-warmed agent is usually already in the room, so ParticipantConnected
+      // won't fire for it — report the output mode now as well
+      if (room.remoteParticipants.size > 0) {
+        publishOutputMode(room, agentVoiceRef.current);
+      }
       await room.localParticipant.setMicrophoneEnabled(true);
 
       setIsConnected(true);
@@ -280,6 +290,8 @@ export default function ChatPage() {
     document.querySelectorAll<HTMLAudioElement>("audio[id^='audio-']").forEach((el) => {
       el.muted = !next;
     });
+    // Tell the agent to skip TTS entirely while voice is off
+    if (roomRef.current) publishOutputMode(roomRef.current, next);
   }, [agentVoiceEnabled]);
 
   return (